@@ -1,9 +1,18 @@
 from flask import Flask, request, render_template, jsonify
-import pandas as pd
 import ollama
+import httpx
+import asyncio
+import atexit
+import os
+import threading
 import concurrent.futures
 from flask_cors import CORS
 import re
+import hashlib
+import functools
+import itertools
+import json
+import diskcache
 import firebase_admin
 from firebase_admin import credentials, firestore
 
@@ -19,19 +28,94 @@ firebase_admin.initialize_app(cred, {
     'databaseURL': 'https://awjplatform-f9f40.firebaseio.com' 
 })
 db = firestore.client()
+FIRESTORE_BATCH_LIMIT = 500
 
 # --------------------------------------------
-# Caching dictionaries for model outputs
+# Pooled Ollama client: a single AsyncClient owned by a background event loop.
+# Every request submits its coroutine to that loop, so connections to the
+# Ollama server are kept alive and reused across requests.
+#
+# Nothing is started at import time. The loop thread is created per process
+# on first use (or from gunicorn's post_fork hook, see gunicorn.conf.py), so
+# a forked worker never inherits a parent's dead loop thread.
 # --------------------------------------------
-project_milestones_cache = {}
-milestone_details_cache = {}
+OLLAMA_MODEL = "mistral"
+OLLAMA_LIMITS = httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30)
+# Bounded so a stalled Ollama server can't hold a connection forever; Ollama
+# keeps loading the model server-side even if we stop waiting.
+OLLAMA_WARMUP_TIMEOUT = 60  # seconds
+
+ollama_loop = None
+ollama_client = None
+_ollama_pid = None
+_ollama_lock = threading.Lock()
+
+def start_ollama():
+    # Starts this process's loop and client, and warms up the model in the
+    # background so the first request doesn't pay the load time.
+    global ollama_loop, ollama_client, _ollama_pid
+    with _ollama_lock:
+        if _ollama_pid == os.getpid():
+            return
+        ollama_loop = asyncio.new_event_loop()
+        threading.Thread(target=ollama_loop.run_forever, name="ollama-loop", daemon=True).start()
+        ollama_client = ollama.AsyncClient(limits=OLLAMA_LIMITS)
+        _ollama_pid = os.getpid()
+        asyncio.run_coroutine_threadsafe(warm_up_model(ollama_client), ollama_loop)
+
+async def warm_up_model(client):
+    # keep_alive=-1 here and on every chat call keeps the model resident in Ollama.
+    try:
+        await asyncio.wait_for(
+            client.chat(model=OLLAMA_MODEL, messages=[{"role": "user", "content": "ok"}], keep_alive=-1),
+            OLLAMA_WARMUP_TIMEOUT,
+        )
+        print("✅ Ollama model loaded!")
+    except Exception as e:
+        print("⚠️ Could not preload Ollama model:", repr(e))
+
+def run_on_ollama_loop(coro):
+    start_ollama()
+    return asyncio.run_coroutine_threadsafe(coro, ollama_loop).result()
+
+@atexit.register
+def close_ollama_client():
+    if _ollama_pid == os.getpid():
+        asyncio.run_coroutine_threadsafe(ollama_client.close(), ollama_loop).result(timeout=5)
+
+# --------------------------------------------
+# Persistent cache for model outputs (survives restarts, size-bounded)
+# --------------------------------------------
+cache = diskcache.Cache("./ollama_cache", size_limit=2**30)
+
+def _key(*parts):
+    # Raw 16-byte digest of the length-prefixed parts: no repr() of the full
+    # inputs, and no ambiguity when a part contains a separator character.
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        encoded = str(part).encode()  # e.g. a CompDescription stored as null
+        h.update(len(encoded).to_bytes(8, "little"))
+        h.update(encoded)
+    return h.digest()
 
 # --------------------------------------------------
 # Step 0: Load the dataset and cache preview from JSONL
 # --------------------------------------------------
 file_path = "finetune_dataset.jsonl"
+
+def read_dataset_rows():
+    # Streams the JSONL one row at a time without loading the whole file.
+    with open(file_path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Only the first few rows are read at startup; they are all the prompts use.
+# A small fixed sample keeps the prompt short; inlining the whole dataset
+# grew every prompt with its size.
+PREVIEW_ROWS = 8
 try:
-    data = pd.read_json(file_path, lines=True)
+    preview_rows = list(itertools.islice(read_dataset_rows(), PREVIEW_ROWS))
     print("✅ Dataset loaded successfully!")
 except FileNotFoundError:
     print("❌ Error: The dataset file was not found. Check the file path!")
@@ -41,19 +125,13 @@ except Exception as e:
     exit()
 
 # Cache the dataset preview (computed only once)
-dataset_preview = data.to_string()
+dataset_preview = "\n".join(json.dumps(row) for row in preview_rows)
+print(f"Dataset preview: {len(preview_rows)} rows (~{len(dataset_preview)//4} tokens)")
 
 # --------------------------------------------------
 # Step 2: Generate Project Milestones (Milestone Names)
 # --------------------------------------------------
-def generate_project_milestones(company_description, project_name, project_description, attempts=0):
-    global dataset_preview
-    # Create a cache key based on inputs
-    cache_key = (company_description, project_name, project_description, dataset_preview)
-    if cache_key in project_milestones_cache:
-        return project_milestones_cache[cache_key]
-    
-    prompt = f"""
+MILESTONES_PROMPT_TEMPLATE = """
 Based on the following company and project overview:
 
 Company Description: {company_description}
@@ -69,10 +147,25 @@ Do not include numbering; just output the milestone names.
 **Output format:**
 Milestones: <milestone1>, <milestone2>, <milestone3>[, ...]
     """
-    response = ollama.chat(model="mistral", messages=[
-        {"role": "system", "content": "You are an AI that generates realistic project milestones."},
+MILESTONES_SYSTEM_MESSAGE = {"role": "system", "content": "You are an AI that generates realistic project milestones."}
+
+async def generate_project_milestones(client, company_description, project_name, project_description, attempts=0):
+    # Create a cache key based on inputs
+    cache_key = _key("milestones", PROMPT_DIGEST, company_description, project_name, project_description)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    prompt = MILESTONES_PROMPT_TEMPLATE.format(
+        company_description=company_description,
+        project_name=project_name,
+        project_description=project_description,
+        dataset_preview=dataset_preview,
+    )
+    response = await client.chat(model=OLLAMA_MODEL, messages=[
+        MILESTONES_SYSTEM_MESSAGE,
         {"role": "user", "content": prompt}
-    ])
+    ], keep_alive=-1)
     generated_text = response.message.content.strip()
 
     milestones = []
@@ -82,12 +175,15 @@ Milestones: <milestone1>, <milestone2>, <milestone3>[, ...]
             milestones = [m.strip() for m in milestones_str.split(",") if m.strip()]
             break
 
-    if not milestones:
+    if milestones:
+        cache.set(cache_key, milestones)
+    else:
         if attempts < 3:
             print(f"Retrying milestone generation for project '{project_name}' (attempt {attempts+1})...")
-            return generate_project_milestones(company_description, project_name, project_description, attempts+1)
+            return await generate_project_milestones(client, company_description, project_name, project_description, attempts+1)
         else:
             print(f"Warning: Could not generate milestones for project '{project_name}' after several attempts. Using default milestones.")
+            # Not cached: the defaults aren't a generation for this project.
             milestones = [
     "Product Backlog Creation",
     "Sprint Planning",
@@ -99,21 +195,13 @@ Milestones: <milestone1>, <milestone2>, <milestone3>[, ...]
     "Release & Deployment",
     "Post-Release Support & Maintenance"
 ]
-    
-    project_milestones_cache[cache_key] = milestones
+
     return milestones
 
 # ---------------------------------------------------------------------
 # Step 3: Generate Milestone Details (Tasks, Time, Resources, KPIs, etc.)
 # ---------------------------------------------------------------------
-def generate_milestone_details_ollama(project_name, project_description, milestone):
-    global dataset_preview
-    # Create a cache key based on inputs
-    cache_key = (project_name, project_description, milestone, dataset_preview)
-    if cache_key in milestone_details_cache:
-        return milestone_details_cache[cache_key]
-    
-    prompt = f"""
+DETAILS_PROMPT_TEMPLATE = """
 Based on the following project overview:
 
 Project Name: {project_name}
@@ -141,46 +229,204 @@ KPI: <kpi>
 Risk Factors: <risk>
 Risk Indicator: <indicator>
     """
-    response = ollama.chat(model="mistral", messages=[
-        {"role": "system", "content": "You are an AI that generates structured project data."},
+DETAILS_SYSTEM_MESSAGE = {"role": "system", "content": "You are an AI that generates structured project data."}
+
+async def generate_milestone_details_ollama(client, project_name, project_description, milestone):
+    # Create a cache key based on inputs
+    cache_key = _key("details", PROMPT_DIGEST, project_name, project_description, milestone)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    prompt = DETAILS_PROMPT_TEMPLATE.format(
+        project_name=project_name,
+        project_description=project_description,
+        milestone=milestone,
+        dataset_preview=dataset_preview,
+    )
+    response = await client.chat(model=OLLAMA_MODEL, messages=[
+        DETAILS_SYSTEM_MESSAGE,
         {"role": "user", "content": prompt}
-    ])
+    ], keep_alive=-1)
     generated_text = response.message.content.strip()
 
-    # Parse the generated text into a dictionary
+    milestone_data = parse_milestone_details(generated_text, milestone)
+    if details_complete(milestone_data):
+        cache.set(cache_key, milestone_data)
+    return milestone_data
+
+# ---------------------------------------------------------------------
+# Helper: Parse a "Key: value" block into a milestone details dictionary
+# ---------------------------------------------------------------------
+EXPECTED_KEYS = frozenset({
+    "Milestone", "Task", "Time Estimate (Days)", "KPI", "Risk Factors", "Risk Indicator"
+})
+
+def parse_milestone_details(generated_text, milestone):
+    milestone_data = parse_detail_fields(generated_text)
+    milestone_data["Milestone"] = milestone  # enforce the milestone name
+    return milestone_data
+
+def parse_detail_fields(generated_text):
     milestone_data = {}
-    expected_keys = [
-        "Milestone", "Task", "Time Estimate (Days)", "KPI", "Risk Factors", "Risk Indicator"
-    ]
-    for line in generated_text.split("\n"):
-        if ":" in line:
-            key, value = line.split(":", 1)
+    for line in generated_text.splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
             key = key.strip()
-            if key in expected_keys:
+            if key in EXPECTED_KEYS:
                 milestone_data[key] = value.strip()
             else:
                 print(f"Warning: Unexpected column '{key}' encountered in milestone generation. Ignoring.")
-    
-    if "Milestone" not in milestone_data or not milestone_data["Milestone"]:
-        milestone_data["Milestone"] = milestone
-    else:
+    return milestone_data
+
+def details_complete(milestone_data):
+    # Only complete results go into the persistent cache.
+    return all(milestone_data.get(key) for key in EXPECTED_KEYS)
+
+def same_milestone_name(a, b):
+    return " ".join(a.split()).casefold() == " ".join(b.split()).casefold()
+
+# ---------------------------------------------------------------------
+# Step 3b: Generate details for all milestones in a single model call
+# ---------------------------------------------------------------------
+MILESTONE_SEPARATOR = "===MILESTONE==="
+
+BATCH_DETAILS_PROMPT_TEMPLATE = """
+Based on the following project overview:
+
+Project Name: {project_name}
+Project Description: {project_description}
+Milestones:
+{milestone_list}
+
+Use the following dataset preview as context:
+{dataset_preview}
+
+For each milestone above, in the same order, generate:
+- Task: multiple comma-separated tasks that reflect the milestone of this project: {project_description}.
+- Time Estimate (Days): numeric value (no extra text) representing the total estimated time in days for the milestone.
+- KPI: exactly one KPI that represents the milestone as a whole (e.g., "Model accuracy > 85%").
+- Risk Factors: milestone-specific risk for the milestone.
+- Risk Indicator: output only one value: "Low", "Medium", or "High" with no extra explanation.
+
+**Important Instruction:**
+- Do not output any placeholder text such as "<To be determined>", "TBD", "to be determined", "n/a", or similar.
+- Start every milestone block with a line containing only {separator}
+
+**Output format (repeat for every milestone):**
+{separator}
+Milestone: <milestone>
+Task: <task1>, <task2>, <task3>
+Time Estimate (Days): <estimate>
+KPI: <kpi>
+Risk Factors: <risk>
+Risk Indicator: <indicator>
+    """
+
+async def generate_all_milestone_details_batch(client, project_name, project_description, milestones):
+    # Returns one details dict per milestone, or None if the response can't be split cleanly.
+    cache_keys = [_key("details", PROMPT_DIGEST, project_name, project_description, m) for m in milestones]
+    cached = [cache.get(k) for k in cache_keys]
+    if all(c is not None for c in cached):
+        return cached
+
+    milestone_list = "\n".join(f"- {m}" for m in milestones)
+    prompt = BATCH_DETAILS_PROMPT_TEMPLATE.format(
+        project_name=project_name,
+        project_description=project_description,
+        milestone_list=milestone_list,
+        dataset_preview=dataset_preview,
+        separator=MILESTONE_SEPARATOR,
+    )
+    response = await client.chat(model=OLLAMA_MODEL, messages=[
+        DETAILS_SYSTEM_MESSAGE,
+        {"role": "user", "content": prompt}
+    ], keep_alive=-1)
+    generated_text = response.message.content.strip()
+
+    # Anything before the first separator is preamble from the model.
+    blocks = [b.strip() for b in generated_text.split(MILESTONE_SEPARATOR)[1:]]
+    if len(blocks) != len(milestones):
+        print(f"Warning: Batch generation returned {len(blocks)} blocks for {len(milestones)} milestones.")
+        return None
+
+    results = []
+    for milestone, block in zip(milestones, blocks):
+        milestone_data = parse_detail_fields(block)
+        # Blocks are matched by position, so a reordered or renamed block
+        # would attach its details to the wrong milestone.
+        if not same_milestone_name(milestone_data.get("Milestone", ""), milestone):
+            print(f"Warning: Batch generation returned block '{milestone_data.get('Milestone', '')}' where '{milestone}' was expected.")
+            return None
+        if "Task" not in milestone_data:
+            print(f"Warning: Batch generation produced no tasks for milestone '{milestone}'.")
+            return None
         milestone_data["Milestone"] = milestone  # enforce the milestone name
+        results.append(milestone_data)
 
-    milestone_details_cache[cache_key] = milestone_data
-    return milestone_data
+    for cache_key, milestone_data in zip(cache_keys, results):
+        if details_complete(milestone_data):
+            cache.set(cache_key, milestone_data)
+    return results
+
+# ---------------------------------------------------------------------
+# Cache namespace: the cache outlives the process, so keys include a digest
+# of the model and prompt context. Changing the model, the dataset preview,
+# a system message or a template then stops old generations from being
+# served. Computed once at startup.
+# ---------------------------------------------------------------------
+PROMPT_DIGEST = _key(
+    OLLAMA_MODEL,
+    dataset_preview,
+    MILESTONES_SYSTEM_MESSAGE["content"],
+    DETAILS_SYSTEM_MESSAGE["content"],
+    MILESTONES_PROMPT_TEMPLATE,
+    DETAILS_PROMPT_TEMPLATE,
+    BATCH_DETAILS_PROMPT_TEMPLATE,
+).hex()
 
 # ----------------------------------------------------
-# Helper: Check if a string has balanced parentheses
+# Helper: Re-join milestone names that were split on a comma inside parentheses
 # ----------------------------------------------------
-def is_balanced(s):
-    return s.count("(") == s.count(")")
+def merge_split_milestones(milestone_names):
+    # Tracks paren depth incrementally, so each name is scanned only once.
+    fixed_milestones, depth, buf = [], 0, ""
+    for m in milestone_names:
+        buf = m if not buf else buf + ", " + m
+        depth += m.count("(") - m.count(")")
+        if depth == 0:
+            fixed_milestones.append(buf)
+            buf = ""
+    if buf:
+        fixed_milestones.append(buf)  # trailing milestone with unbalanced parens
+    return fixed_milestones
 
 # ---------------------------------------------------------------------
-# Process milestones in parallel
+# Helper: Group milestone indices into bins of similar name length
 # ---------------------------------------------------------------------
-def process_milestone(milestone, project_name, project_description):
+# Requests Ollama can serve at once; keep in line with OLLAMA_NUM_PARALLEL.
+MAX_PARALLEL_DETAILS = 8
+
+def bin_by_length(milestones, max_parallel=MAX_PARALLEL_DETAILS):
+    # Everything fits in one concurrent round: binning would only serialize it.
+    if len(milestones) <= max_parallel:
+        return [list(range(len(milestones)))] if milestones else []
+    # Otherwise use as few rounds as possible, grouping similar name lengths
+    # (a cheap proxy for how long the generated details will be).
+    order = sorted(range(len(milestones)), key=lambda i: len(milestones[i]))
+    bins = -(-len(order) // max_parallel)  # ceiling division
+    size = -(-len(order) // bins)
+    return [order[i:i + size] for i in range(0, len(order), size)]
+
+# ---------------------------------------------------------------------
+# Process milestones concurrently
+# ---------------------------------------------------------------------
+async def process_milestone(client, milestone, project_name, project_description):
     print("Processing milestone:", milestone)
-    milestone_details = generate_milestone_details_ollama(project_name, project_description, milestone)
+    milestone_details = await generate_milestone_details_ollama(client, project_name, project_description, milestone)
+    return build_milestone_row(milestone, milestone_details, project_name, project_description)
+
+def build_milestone_row(milestone, milestone_details, project_name, project_description):
     milestone_details["Milestone"] = milestone  # enforce the milestone name
     new_row = {
         "Project Name": project_name,
@@ -192,36 +438,74 @@ def process_milestone(milestone, project_name, project_description):
 # ----------------------------------------------------
 # Run Model: Receives input data and returns output data
 # ----------------------------------------------------
-def run_model(company_description, project_name, project_description):
+async def run_model(company_description, project_name, project_description):
+    # Runs on ollama_loop (via run_on_ollama_loop), which owns the shared
+    # client's connection pool.
+    client = ollama_client
+
     # Generate project milestones.
-    milestone_names = generate_project_milestones(company_description, project_name, project_description)
+    milestone_names = await generate_project_milestones(client, company_description, project_name, project_description)
     print(f"Milestones: {milestone_names}")
 
     # Fix the milestone list (merge split milestones if needed).
-    fixed_milestones = []
-    i = 0
-    while i < len(milestone_names):
-        combined = milestone_names[i]
-        while not is_balanced(combined) and i < len(milestone_names)-1:
-            i += 1
-            combined += ", " + milestone_names[i]
-        fixed_milestones.append(combined)
-        i += 1
+    fixed_milestones = merge_split_milestones(milestone_names)
     print("Fixed Milestones:", fixed_milestones)
 
-    # Process milestones concurrently while preserving order.
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(
-            lambda milestone: process_milestone(milestone, project_name, project_description),
-            fixed_milestones
-        ))
-    augmented_data = results
+    # Ask for every milestone in one call; fall back to per-milestone calls
+    # if the model's response can't be split back into the expected blocks.
+    batch_details = await generate_all_milestone_details_batch(client, project_name, project_description, fixed_milestones)
+    if batch_details is not None:
+        return [
+            build_milestone_row(milestone, details, project_name, project_description)
+            for milestone, details in zip(fixed_milestones, batch_details)
+        ]
+
+    # Process milestones concurrently, one length bin at a time, so requests
+    # batched together by Ollama finish at similar times. Results keep the
+    # original milestone order.
+    augmented_data = [None] * len(fixed_milestones)
+    for milestone_bin in bin_by_length(fixed_milestones):
+        results = await asyncio.gather(*[
+            process_milestone(client, fixed_milestones[i], project_name, project_description)
+            for i in milestone_bin
+        ])
+        for i, result in zip(milestone_bin, results):
+            augmented_data[i] = result
 
     return augmented_data
 
 # (Optional) If you need to expose the dataset elsewhere.
+# The full dataset is only parsed the first time it's asked for.
+@functools.lru_cache(maxsize=None)
 def get_dataset():
-    return data
+    return list(read_dataset_rows())
+
+# ---------------------------------------------
+# Milestone ID allocation
+# ---------------------------------------------
+# The next free milestone number lives in a single counter document, so
+# allocating IDs doesn't require reading the whole Milestones collection.
+milestone_counter_ref = db.collection("Counters").document("milestones")
+MILESTONE_ID_RE = re.compile(r"m(\d{3})$")
+
+def seed_next_milestone_number():
+    # One-time fallback for databases created before the counter document existed.
+    existing_milestone_numbers = []
+    for doc_ref in db.collection("Milestones").list_documents():
+        m_match = MILESTONE_ID_RE.match(doc_ref.id)
+        if m_match:
+            existing_milestone_numbers.append(int(m_match.group(1)))
+    return max(existing_milestone_numbers, default=0) + 1
+
+@firestore.transactional
+def reserve_milestone_numbers(transaction, count):
+    snapshot = milestone_counter_ref.get(transaction=transaction)
+    if snapshot.exists:
+        start = snapshot.to_dict()["next"]
+    else:
+        start = seed_next_milestone_number()
+    transaction.set(milestone_counter_ref, {"next": start + count}, merge=True)
+    return start
 
 # ---------------------------------------------
 # Flask Routes
@@ -248,52 +532,46 @@ def index():
     else:
         company_id = company_ref_value
 
-    # Retrieve company details
+    # Retrieve company details, the saved project (assumed saved by client)
+    # and any existing milestones concurrently; none depends on another.
     company_ref = db.collection("Company").document(company_id)
-    company_doc = company_ref.get()
+    project_collection = db.collection("Project")
+    milestone_collection = db.collection("Milestones")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        fut_company = executor.submit(company_ref.get)
+        fut_project = executor.submit(lambda: list(
+            project_collection.where("ProjectName", "==", project_name).limit(1).stream()
+        ))
+        fut_existing = executor.submit(lambda: list(
+            milestone_collection.where("ProjectID", "==", ProjectID).stream()
+        ))
+    company_doc = fut_company.result()
+    project_docs = fut_project.result()
+    existing_milestone_docs = fut_existing.result()
+
     if not company_doc.exists:
         return "Company not found!!", 404
     company_data = company_doc.to_dict()
     company_description = company_data.get("CompDescription", "")
 
-    # Generate milestones using your model
-    print("start generating")
-    milestones_generated = run_model(company_description, project_name, project_description)
-    print(f"Generated Milestones: {milestones_generated}")
-
-    # Retrieve the saved project (assumed saved by client) from Firestore
-    project_collection = db.collection("Project")
-    query_projects = project_collection.where("ProjectName", "==", project_name).stream()
-    project_doc = None
-    for doc in query_projects:
-        project_doc = doc
-        break
-    if project_doc is None:
+    if not project_docs:
         return "Project not found", 404
-    project_data = project_doc.to_dict()
+    project_data = project_docs[0].to_dict()
     print(f"Retrieved project with ID: {ProjectID}")
 
-    # Check if milestones already exist for this project
-    milestone_collection = db.collection("Milestones")
-    query_milestones = milestone_collection.where("ProjectID", "==", ProjectID).stream()
-    existing_milestones = [doc.to_dict() for doc in query_milestones]
-
-    if not existing_milestones:
-        # Determine next available milestone ID
-        milestone_docs = milestone_collection.get()
-        existing_milestone_numbers = []
-        for doc in milestone_docs:
-            m_match = re.match(r"m(\d{3})$", doc.id)
-            if m_match:
-                existing_milestone_numbers.append(int(m_match.group(1)))
-        existing_milestone_numbers.sort()
-        next_milestone_number = 1
-        for num in existing_milestone_numbers:
-            if num != next_milestone_number:
-                break
-            next_milestone_number += 1
+    if not existing_milestone_docs:
+        # Generate milestones using your model
+        print("start generating")
+        milestones_generated = run_on_ollama_loop(run_model(company_description, project_name, project_description))
+        print(f"Generated Milestones: {milestones_generated}")
+
+        # Reserve a contiguous block of milestone IDs
+        next_milestone_number = reserve_milestone_numbers(db.transaction(), len(milestones_generated))
 
-        # Save generated milestones to Firestore
+        # Save generated milestones to Firestore in batched writes
+        # (Firestore allows at most 500 operations per batch)
+        milestones = []
+        batch, pending_writes = db.batch(), 0
         for milestone in milestones_generated:
             milestone_id = f"m{next_milestone_number:03d}"
             next_milestone_number += 1
@@ -307,12 +585,17 @@ def index():
                 "RiskFactors": milestone.get("Risk Factors", ""),
                 "RiskIndicator": milestone.get("Risk Indicator", ""),
             }
-            milestone_collection.document(milestone_id).set(milestone_data)
-            print(f"Saved milestone '{milestone.get('Milestone', '')}' with ID: {milestone_id}")
-        query_milestones = milestone_collection.where("ProjectID", "==", ProjectID).stream()
-        milestones = [doc.to_dict() for doc in query_milestones]
+            batch.set(milestone_collection.document(milestone_id), milestone_data)
+            pending_writes += 1
+            milestones.append(milestone_data)
+            if pending_writes == FIRESTORE_BATCH_LIMIT:
+                batch.commit()
+                batch, pending_writes = db.batch(), 0
+        if pending_writes:
+            batch.commit()
+        print(f"Saved {len(milestones)} milestones for project {ProjectID}")
     else:
-        milestones = existing_milestones
+        milestones = [doc.to_dict() for doc in existing_milestone_docs]
 
     return jsonify({
         "project_name": project_name,
@@ -321,4 +604,5 @@ def index():
     })
 
 if __name__ == '__main__':
-    app.run(debug=True, use_reloader=False, host="0.0.0.0")
\ No newline at end of file
+    start_ollama()
+    app.run(use_reloader=False, host="0.0.0.0")
\ No newline at end of file
@@ -0,0 +1,9 @@
+# Gunicorn loads this file automatically from the working directory.
+
+def post_fork(server, worker):
+    # Start each worker's own Ollama event loop (and background model warm-up)
+    # right after it forks, rather than on its first request. Doing this per
+    # worker keeps --preload safe: a loop thread started in the master would
+    # not survive the fork.
+    from GenerateMilestones import start_ollama
+    start_ollama()
@@ -0,0 +1,8 @@
+# WSGI entry point for production servers, e.g.:
+#   gunicorn -k gthread -w 4 --threads 8 --timeout 300 wsgi:app
+# (gunicorn.conf.py starts the Ollama loop in each worker.)
+from GenerateMilestones import app, start_ollama
+
+if __name__ == '__main__':
+    start_ollama()
+    app.run(host="0.0.0.0")